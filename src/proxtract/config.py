@@ -2,100 +2,184 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+import os
+from functools import lru_cache
+from pathlib import Path, PurePath
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
 
 from .state import AppState
 from .utils import normalize_bool
 
-try:  # Python 3.11+
-    import tomllib as _tomllib  # type: ignore[assignment]
-except Exception:  # pragma: no cover - fallback to tomli if available
-    try:
-        import tomli as _tomllib  # type: ignore
-    except Exception:  # pragma: no cover - optional dependency missing
-        _tomllib = None  # type: ignore
+# TOML libraries are imported on first use; tests may assign these directly.
+_UNRESOLVED: Any = object()
+_tomllib: Any = _UNRESOLVED
+_tomli_w: Any = _UNRESOLVED
+
+
+def _get_tomllib() -> Any:
+    global _tomllib
+    if _tomllib is _UNRESOLVED:
+        try:  # Python 3.11+
+            import tomllib as module  # type: ignore[import-not-found]
+        except Exception:  # pragma: no cover - fallback to tomli if available
+            try:
+                import tomli as module  # type: ignore
+            except Exception:  # pragma: no cover - optional dependency missing
+                module = None
+        _tomllib = module
+    return _tomllib
+
+
+def _get_tomli_w() -> Any:
+    global _tomli_w
+    if _tomli_w is _UNRESOLVED:
+        try:  # TOML writing library
+            import tomli_w as module  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency missing
+            module = None
+        _tomli_w = module
+    return _tomli_w
+
+
+@lru_cache(maxsize=1)
+def _config_path() -> Path:
+    return Path("~/.config/proxtract/settings.toml").expanduser()
 
-try:  # TOML writing library
-    import tomli_w as _tomli_w  # type: ignore[assignment]
-except Exception:  # pragma: no cover - optional dependency missing
-    _tomli_w = None  # type: ignore
 
+def _path_str(value: Any) -> str:
+    # Path objects cache their string form; only plain strings need normalising.
+    if isinstance(value, PurePath):
+        return os.fspath(value)
+    return str(Path(value))
+
+
+def _coerce_str_list(value: Any) -> Optional[list[str]]:
+    if not isinstance(value, list):
+        return None
+    return [item if type(item) is str else str(item) for item in value]
 
-def _config_path() -> Path:
-    return Path("~/.config/proxtract/settings.toml").expanduser()
 
+# Last parsed config, keyed on (path, st_mtime_ns, st_size) so edits invalidate it.
+_LOAD_CACHE: Dict[Tuple[Path, int, int], Mapping[str, Any]] = {}
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+
+def _clear_load_cache() -> None:
+    _LOAD_CACHE.clear()
+
+
+def load_config() -> Mapping[str, Any]:
+    """Return the parsed settings file, cached until the file changes.
+
+    The result is shared between callers. The top-level mapping is read-only,
+    but nested values such as pattern lists are not, so callers must not
+    mutate them.
+    """
 
-def load_config() -> Dict[str, Any]:
     path = _config_path()
-    if not path.exists() or _tomllib is None:
-        return {}
+    tomllib = _get_tomllib()
+    if tomllib is None:
+        return _EMPTY_CONFIG
     try:
-        return _tomllib.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+        stat = os.stat(path)
+    except OSError:
+        return _EMPTY_CONFIG
+    if not stat.st_size:
+        return _EMPTY_CONFIG
+
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    parsed = _LOAD_CACHE.get(key)
+    if parsed is None:
+        try:
+            # tomllib decodes UTF-8 itself when handed a binary file.
+            with path.open("rb") as handle:
+                parsed = MappingProxyType(tomllib.load(handle))
+        except Exception:
+            return _EMPTY_CONFIG
+        _clear_load_cache()
+        _LOAD_CACHE[key] = parsed
+    return parsed
+
 
+def _as_path(value: Any, current: Any) -> Path:
+    return Path(value).expanduser()
 
-def apply_config(state: AppState, data: Dict[str, Any]) -> AppState:
+
+def _as_int(value: Any, current: Any) -> Any:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return current
+
+
+def _as_str(value: Any, current: Any) -> str:
+    return str(value)
+
+
+def _as_str_list(value: Any, current: Any) -> Any:
+    coerced = _coerce_str_list(value)
+    return current if coerced is None else coerced
+
+
+def _as_str_set(value: Any, current: Any) -> Any:
+    # ``None`` re-enables the built-in filters; an empty list disables them.
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return {str(item) for item in value}
+    return current
+
+
+# (config key / AppState attribute, caster(value, current) -> new value)
+_APPLY_SCHEMA: Tuple[Tuple[str, Callable[[Any, Any], Any]], ...] = (
+    ("source_root", _as_path),
+    ("output_path", _as_path),
+    ("max_size_kb", _as_int),
+    ("compact_mode", normalize_bool),
+    ("skip_empty", normalize_bool),
+    ("use_gitignore", normalize_bool),
+    ("force_include", normalize_bool),
+    ("include_patterns", _as_str_list),
+    ("exclude_patterns", _as_str_list),
+    ("skip_extensions", _as_str_set),
+    ("skip_patterns", _as_str_set),
+    ("skip_files", _as_str_set),
+    ("tokenizer_model", _as_str),
+    ("enable_token_count", normalize_bool),
+    ("copy_to_clipboard", normalize_bool),
+)
+
+
+def apply_config(state: AppState, data: Mapping[str, Any]) -> AppState:
     if not data:
         return state
 
-    # Helper function to safely convert to int
-    def safe_int(value, default):
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return default
-
-    source_root = data.get("source_root", state.source_root)
-    state.source_root = Path(source_root).expanduser()
-
-    output_path = data.get("output_path", state.output_path)
-    state.output_path = Path(output_path).expanduser()
-    
-    state.max_size_kb = safe_int(data.get("max_size_kb", state.max_size_kb), state.max_size_kb)
-    state.compact_mode = normalize_bool(data.get("compact_mode", state.compact_mode), state.compact_mode)
-    state.skip_empty = normalize_bool(data.get("skip_empty", state.skip_empty), state.skip_empty)
-    state.use_gitignore = normalize_bool(data.get("use_gitignore", state.use_gitignore), state.use_gitignore)
-    state.force_include = normalize_bool(data.get("force_include", state.force_include), state.force_include)
-
-    include = data.get("include_patterns")
-    if isinstance(include, list):
-        state.include_patterns = [str(item) for item in include]
-
-    exclude = data.get("exclude_patterns")
-    if isinstance(exclude, list):
-        state.exclude_patterns = [str(item) for item in exclude]
-
-    # Filter configuration - allow overriding hardcoded filters
-    skip_extensions = data.get("skip_extensions", state.skip_extensions)
-    if skip_extensions is None:
-        state.skip_extensions = None
-    elif isinstance(skip_extensions, list):
-        state.skip_extensions = {str(item) for item in skip_extensions}
-
-    skip_patterns = data.get("skip_patterns", state.skip_patterns)
-    if skip_patterns is None:
-        state.skip_patterns = None
-    elif isinstance(skip_patterns, list):
-        state.skip_patterns = {str(item) for item in skip_patterns}
-
-    skip_files = data.get("skip_files", state.skip_files)
-    if skip_files is None:
-        state.skip_files = None
-    elif isinstance(skip_files, list):
-        state.skip_files = {str(item) for item in skip_files}
-
-    state.tokenizer_model = str(data.get("tokenizer_model", state.tokenizer_model))
-    state.enable_token_count = normalize_bool(
-        data.get("enable_token_count", state.enable_token_count), state.enable_token_count
-    )
-    state.copy_to_clipboard = normalize_bool(
-        data.get("copy_to_clipboard", state.copy_to_clipboard), state.copy_to_clipboard
-    )
+    for key, cast in _APPLY_SCHEMA:
+        if key in data:
+            setattr(state, key, cast(data[key], getattr(state, key)))
     return state
 
 
+# Basic-string escapes for the manual TOML writer, applied in a single pass.
+_TOML_ESC = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\t": "\\t"})
+_TOML_BOOLS: Dict[bool, str] = {True: "true", False: "false"}
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    # Raw fd writes skip the TextIOWrapper/BufferedWriter layers of Path.open.
+    # O_BINARY keeps Windows from translating newlines; 0o666 leaves the final
+    # permissions to the umask, as open("w") does.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def save_config(state: AppState) -> None:
     path = _config_path()
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -104,8 +188,8 @@ def save_config(state: AppState) -> None:
     output_path = getattr(state, "output_path", Path("extracted.txt"))
 
     data: Dict[str, Any] = {
-        "source_root": str(Path(source_root)),
-        "output_path": str(Path(output_path)),
+        "source_root": _path_str(source_root),
+        "output_path": _path_str(output_path),
         "max_size_kb": int(state.max_size_kb),
         "compact_mode": bool(state.compact_mode),
         "skip_empty": bool(state.skip_empty),
@@ -128,34 +212,41 @@ def save_config(state: AppState) -> None:
     _serialize_optional_iterable("skip_files", getattr(state, "skip_files", None))
 
     # Use proper TOML library if available, otherwise fall back to manual construction
-    if _tomli_w is not None:
+    payload: Optional[str] = None
+    tomli_w = _get_tomli_w()
+    if tomli_w is not None:
         try:
-            with path.open("wb") as handle:
-                _tomli_w.dump(data, handle)
-            return
+            payload = tomli_w.dumps(data)
         except Exception:
             # Fall back to manual construction if TOML serialization fails
-            pass
-
-    # Fallback to manual construction if TOML library is not available or fails
-    def _escape(item: str) -> str:
-        return item.replace("\\", "\\\\").replace('"', '\\"')
-
-    lines: list[str] = []
-    for key, value in data.items():
-        if isinstance(value, bool):
-            rendered = "true" if value else "false"
-        elif isinstance(value, int):
-            rendered = str(value)
-        elif isinstance(value, (list, set)):
-            rendered = "[" + ", ".join(f'"{_escape(entry)}"' for entry in value) + "]"
-        else:
-            rendered = f'"{_escape(str(value))}"'
-        lines.append(f"{key} = {rendered}")
-
-    with path.open("w", encoding="utf-8") as handle:
-        handle.write("\n".join(lines))
-        handle.write("\n")
+            payload = None
+
+    if payload is None:
+        def _escape(item: str) -> str:
+            return item.translate(_TOML_ESC)
+
+        lines: list[str] = []
+        for key, value in data.items():
+            if isinstance(value, bool):
+                rendered = _TOML_BOOLS[value]
+            elif isinstance(value, int):
+                rendered = str(value)
+            elif isinstance(value, (list, set)):
+                rendered = "[" + ", ".join(f'"{_escape(entry)}"' for entry in value) + "]"
+            else:
+                rendered = f'"{_escape(str(value))}"'
+            lines.append(key + " = " + rendered)
+        payload = "\n".join(lines) + "\n"
+
+    encoded = payload.encode("utf-8")
+    try:
+        if path.read_bytes() == encoded:
+            return
+    except OSError:
+        pass
+    _write_bytes(path, encoded)
+    # Coarse mtimes can leave a same-size rewrite with an unchanged cache key.
+    _clear_load_cache()
 
 
 __all__ = ["load_config", "apply_config", "save_config"]
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, DefaultDict, Dict, Iterable, Optional, Protocol
+from typing import Callable, DefaultDict, Dict, Iterable, Iterator, Optional, Pattern, Protocol
 import fnmatch
 import os
+import re
 import tempfile
 
 try:  # Optional dependency for .gitignore support
@@ -95,6 +97,100 @@ class ExtractionError(RuntimeError):
     """Raised when extraction cannot be performed."""
 
 
+# Magic bytes of common binary formats, checked in one ``bytes.startswith`` call.
+_BINARY_SIGNATURES = (
+    # Images
+    b'\x89PNG',
+    b'\xff\xd8\xff',  # JPEG
+    b'GIF8',
+    b'RIFF',  # may be webp or other RIFF-based format
+    # Archives and OOXML documents
+    b'PK\x03\x04',
+    b'PK\x05\x06',  # empty zip
+    b'PK\x07\x08',  # spanned zip
+    b'RARF',
+    b'7z\xbc\xaf\x27\x1c',
+    b'\x1f\x8b',  # gzip
+    b'BZh',
+    # Documents
+    b'%PDF',
+    b'\xd0\xcf\x11\xe0',  # MS Office
+    # Audio/Video
+    b'fLaC',
+    b'ID3',  # MP3 with ID3
+    b'OggS',
+    b'\x00\x00\x00\x20ftyp',  # MP4/M4A
+    # Executables
+    b'MZ',  # PE
+    b'\x7fELF',
+    # Database files
+    b'SQLite',
+)
+
+# Printable ASCII plus the whitespace controls that text files routinely contain.
+_ASCII_TEXT_BYTES = bytes(range(0x20, 0x7F)) + b"\n\r\t"
+
+_SUFFIX_PATTERN = re.compile(r"\*\.[A-Za-z0-9_]+")
+
+
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: frozenset[str]) -> tuple[tuple[str, ...], Optional[Pattern[str]]]:
+    """Split glob ``patterns`` into plain suffixes and one combined regex.
+
+    ``*.ext`` globs match exactly the paths ending in ``.ext``, so they are
+    checked with ``str.endswith``; everything else is folded into a single
+    regex with ``fnmatch`` semantics.
+    """
+
+    suffixes: list[str] = []
+    globs: list[str] = []
+    for pattern in patterns:
+        pattern = os.path.normcase(pattern)
+        if _SUFFIX_PATTERN.fullmatch(pattern):
+            suffixes.append(pattern[1:])
+        else:
+            globs.append(pattern)
+    matcher = re.compile("|".join(fnmatch.translate(glob) for glob in globs)) if globs else None
+    return tuple(sorted(suffixes)), matcher
+
+
+def _sorted_entries(directory: str) -> Iterator[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except OSError:  # Unreadable directories are skipped, like Path.rglob
+        return iter(())
+    return iter(entries)
+
+
+def _walk_files(
+    root: str,
+    skip_dir: Optional[Callable[[os.DirEntry[str]], bool]] = None,
+) -> Iterator[os.DirEntry[str]]:
+    """Yield file entries below ``root`` in sorted path order.
+
+    ``DirEntry`` answers the file/directory checks from the directory listing,
+    so no extra ``stat`` call is made per entry. Symlinked directories are not
+    descended into, matching ``Path.rglob``. Directories for which ``skip_dir``
+    returns ``True`` are not entered at all.
+    """
+
+    stack = [_sorted_entries(root)]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if skip_dir is None or not skip_dir(entry):
+                    stack.append(_sorted_entries(entry.path))
+            elif entry.is_file():
+                yield entry
+        except OSError:
+            continue
+
+
 class FileExtractor:
     """Extract text-friendly files from a project tree into a single document."""
 
@@ -162,8 +258,28 @@ class FileExtractor:
         self.skip_patterns = _coerce_set(default_patterns) if skip_patterns is None else _coerce_set(skip_patterns)
         self.skip_files = _coerce_set(default_files) if skip_files is None else _coerce_set(skip_files)
 
+        # Pattern matchers are compiled once here and reused for every file:
+        # ``*.ext`` globs become suffix tuples, the rest one regex per set.
+        self._include_suffixes, self._include_re = _compile_patterns(frozenset(self.include_patterns))
+        self._exclude_suffixes, self._exclude_re = _compile_patterns(frozenset(self.exclude_patterns))
+        self._skip_suffixes, self._skip_re = _compile_patterns(frozenset(self.skip_patterns))
+
         self._root_path: Optional[Path] = None
         self._gitignore_spec = None
+        self._encoder = None
+        self._encoder_model: Optional[str] = None
+
+    def _get_encoder(self, model: str):
+        """Return a tiktoken encoder for ``model``, reusing it across runs."""
+
+        if self._encoder is None or self._encoder_model != model:
+            try:
+                encoder = _tiktoken.encoding_for_model(model)  # type: ignore[union-attr]
+            except Exception:
+                encoder = _tiktoken.get_encoding("cl100k_base")  # type: ignore[union-attr]
+            self._encoder = encoder
+            self._encoder_model = model
+        return self._encoder
 
     def _rel(self, file_path: Path) -> str:
         assert self._root_path is not None
@@ -171,16 +287,43 @@ class FileExtractor:
 
     @staticmethod
     def _match_any(patterns: Iterable[str], rel: str) -> bool:
-        for pattern in patterns:
-            if fnmatch.fnmatch(rel, pattern):
-                return True
-        return False
+        if not isinstance(patterns, frozenset):
+            patterns = frozenset(patterns)
+        return FileExtractor._matches(*_compile_patterns(patterns), rel)
+
+    @staticmethod
+    def _matches(suffixes: tuple[str, ...], matcher: Optional[Pattern[str]], rel: str) -> bool:
+        rel = os.path.normcase(rel)
+        if suffixes and rel.endswith(suffixes):
+            return True
+        return matcher is not None and matcher.match(rel) is not None
+
+    def _is_pruned_dir(self, name: str) -> bool:
+        """Return ``True`` if every file below directory ``name`` would be skipped.
+
+        Mirrors the per-file ``excluded_path`` check so whole subtrees can be
+        dropped without listing them. A pruned directory is reported once as
+        ``excluded_path``, even for files inside it that the per-file checks
+        would have attributed to an earlier reason such as ``gitignore`` or
+        ``excluded_ext``. Include patterns can re-admit files inside such
+        directories, so nothing is pruned while they are set.
+        """
 
-    def _should_skip(self, file_path: Path, *, include_override: bool) -> tuple[bool, str]:
+        if self.include_patterns:
+            return False
+        return name in self.skip_patterns or name.startswith(".")
+
+    def _should_skip(
+        self,
+        file_path: Path,
+        *,
+        include_override: bool,
+        entry: Optional[os.DirEntry[str]] = None,
+    ) -> tuple[bool, str]:
         rel = self._rel(file_path)
         include_forced = include_override and self.force_include
 
-        if not include_forced and self._match_any(self.exclude_patterns, rel):
+        if not include_forced and self._matches(self._exclude_suffixes, self._exclude_re, rel):
             return True, "excluded_pattern"
 
         if (
@@ -202,7 +345,7 @@ class FileExtractor:
 
             # Check if filename matches any skip patterns
             rel = self._rel(file_path)
-            if self._match_any(self.skip_patterns, rel):
+            if self._matches(self._skip_suffixes, self._skip_re, rel):
                 return True, "excluded_path"
 
             for part in file_path.parts:
@@ -210,7 +353,9 @@ class FileExtractor:
                     return True, "excluded_path"
 
         try:
-            size = file_path.stat().st_size
+            # DirEntry caches its stat result, so the size check and the
+            # later text sniffing share a single syscall.
+            size = (entry or file_path).stat().st_size
         except OSError as exc:  # Permission denied, etc.
             raise ExtractionError(f"Unable to inspect file '{file_path}': {exc}") from exc
 
@@ -223,13 +368,14 @@ class FileExtractor:
         return False, ""
 
     @staticmethod
-    def _is_text_file(file_path: Path) -> bool:
+    def _is_text_file(file_path: Path, size: Optional[int] = None) -> bool:
         """Enhanced text file detection with binary detection."""
         # Check file size first - very small files are often text
-        try:
-            size = file_path.stat().st_size
-        except OSError:
-            return False
+        if size is None:
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                return False
             
         if size == 0:
             return True
@@ -244,40 +390,8 @@ class FileExtractor:
             return False
             
         # Check for common binary file signatures (magic bytes)
-        binary_signatures = {
-            # Images
-            b'\x89PNG': '.png',
-            b'\xff\xd8\xff': '.jpg',
-            b'GIF8': '.gif',
-            b'RIFF': '.webp',  # may be webp or other RIFF-based format
-            # Archives
-            b'PK\x03\x04': '.zip',
-            b'PK\x05\x06': '.zip',  # empty zip
-            b'PK\x07\x08': '.zip',  # spanned zip
-            b'RARF': '.rar',
-            b'7z\xbc\xaf\x27\x1c': '.7z',
-            b'\x1f\x8b': '.gz',
-            b'BZh': '.bz2',
-            # Documents
-            b'%PDF': '.pdf',
-            b'\xd0\xcf\x11\xe0': '.doc',  # MS Office
-            b'PK\x03\x04': '.docx',  # OOXML
-            # Audio/Video
-            b'fLaC': '.flac',
-            b'ID3': '.mp3',  # MP3 with ID3
-            b'OggS': '.ogg',
-            # Executables
-            b'MZ': '.exe',
-            b'\x7fELF': '.elf',
-            # Database files
-            b'SQLite': '.sqlite',
-            b'\x00\x00\x00\x20ftyp': '.mp4',  # MP4/M4A
-        }
-        
-        # Check for magic bytes
-        for signature in binary_signatures:
-            if data.startswith(signature):
-                return False
+        if data.startswith(_BINARY_SIGNATURES):
+            return False
                 
         # Check for null bytes (strong indicator of binary content)
         # But allow null bytes in specific file types that might contain them
@@ -286,6 +400,12 @@ class FileExtractor:
             null_ratio = data.count(b'\x00') / len(data)
             if null_ratio > 0.1:  # More than 10% null bytes
                 return False
+
+        if data.isascii():
+            # ASCII decodes identically under every candidate encoding below, so
+            # the control-character ratio can be counted in one C-level pass.
+            control_bytes = len(data.translate(None, _ASCII_TEXT_BYTES))
+            return not data or control_bytes / len(data) <= 0.1
                 
         # Try to decode as text with different encodings
         encodings = ["utf-8", "utf-8-sig", "cp1252", "latin-1", "cp1251"]
@@ -413,10 +533,7 @@ class FileExtractor:
                     else:
                         try:
                             token_model = self.tokenizer_model or "gpt-4"
-                            try:
-                                encoder = _tiktoken.encoding_for_model(token_model)
-                            except Exception:
-                                encoder = _tiktoken.get_encoding("cl100k_base")
+                            encoder = self._get_encoder(token_model)
                             token_count = 0
                         except Exception as exc:  # pragma: no cover - defensive
                             errors.append(f"Failed to initialize tokenizer: {exc}")
@@ -430,25 +547,34 @@ class FileExtractor:
                     except TypeError:
                         progress_callback(1)  # type: ignore[misc]
 
-                for file_path in sorted(root_path.rglob("*")):
-                    if not file_path.is_file():
-                        continue
+                def skip_dir(dir_entry: os.DirEntry[str]) -> bool:
+                    if not self._is_pruned_dir(dir_entry.name):
+                        return False
+                    relative_dir = str(Path(dir_entry.path).relative_to(root_path))
+                    skipped_paths["excluded_path"].append(relative_dir)
+                    report(f"Skipping {relative_dir}")
+                    return True
 
+                for entry in _walk_files(str(root_path), skip_dir):
+                    file_path = Path(entry.path)
                     relative_path = file_path.relative_to(root_path)
                     relative_str = str(relative_path)
 
-                    if temp_path_resolved is not None and file_path.resolve() == temp_path_resolved:
+                    # ``root_path`` is resolved and the walk never follows symlinked
+                    # directories, so only symlinked files need resolving here.
+                    resolved_path = file_path.resolve() if entry.is_symlink() else file_path
+                    if temp_path_resolved is not None and resolved_path == temp_path_resolved:
                         continue
-                    if file_path.resolve() == output_path:
+                    if resolved_path == output_path:
                         report(f"Skipping {relative_str}")
                         continue
 
                     include_override = False
                     if self.include_patterns:
-                        include_override = self._match_any(self.include_patterns, relative_str)
+                        include_override = self._matches(self._include_suffixes, self._include_re, relative_str)
 
                     try:
-                        skip, reason = self._should_skip(file_path, include_override=include_override)
+                        skip, reason = self._should_skip(file_path, include_override=include_override, entry=entry)
                     except ExtractionError as exc:
                         errors.append(str(exc))
                         skipped_paths["other"].append(relative_str)
@@ -461,7 +587,7 @@ class FileExtractor:
                         report(f"Skipping {relative_str}")
                         continue
 
-                    if not self._is_text_file(file_path):
+                    if not self._is_text_file(file_path, entry.stat().st_size):
                         skipped_paths["binary"].append(relative_str)
                         report(f"Skipping {relative_str}")
 
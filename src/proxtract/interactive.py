@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
+import threading
 from pathlib import Path
 from typing import Iterable
 
-from rich.console import Console
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Grid, Horizontal, Vertical
@@ -14,6 +16,12 @@ from textual.widgets import Button, Checkbox, Footer, Input, Log, Static
 from .config import apply_config, load_config, save_config
 from .core import ExtractionError, ExtractionStats
 from .state import AppState
+from .utils import load_pyperclip, read_clipboard_payload
+
+# Progress lines are forwarded to the log at most once per frame (~60 FPS).
+_PROGRESS_FLUSH_INTERVAL = 0.016
+
+_PATTERN_SPLIT_RE = re.compile(r"\s*,\s*")
 
 
 class InteractiveShell(App[None]):
@@ -127,10 +135,32 @@ class InteractiveShell(App[None]):
         Binding("f5", "refresh", "Обновить"),
     ]
 
+    # (input id, label, placeholder)
+    _FORM_FIELDS = (
+        ("source_path", "Source path", "Путь к проекту"),
+        ("output_path", "Output file", "Файл для сохранения"),
+        ("max_size_kb", "Max size (KB)", "500"),
+        ("tokenizer_model", "Tokenizer model", "gpt-4o"),
+        ("include_patterns", "Include patterns", "src/**/*.py, README.md"),
+        ("exclude_patterns", "Exclude patterns", "tests/**"),
+    )
+
+    # (checkbox id, label, AppState attribute)
+    _TOGGLE_SPECS = (
+        ("compact_mode", "Компактный режим", "compact_mode"),
+        ("skip_empty", "Пропускать пустые", "skip_empty"),
+        ("use_gitignore", "Использовать .gitignore", "use_gitignore"),
+        ("force_include", "Принудительно включать", "force_include"),
+        ("count_tokens", "Считать токены", "enable_token_count"),
+        ("copy_clipboard", "Копировать в буфер", "copy_to_clipboard"),
+    )
+
     def __init__(self, *, state: AppState | None = None) -> None:
         super().__init__()
         self.state = apply_config(state or AppState(), load_config())
-        self._log_widget: Log | None = None
+        self._log_widget: Log  # Assigned in on_mount, before any handler runs.
+        self._inputs: dict[str, Input] = {}
+        self._checkboxes: dict[str, Checkbox] = {}
         self._messages: list[str] = []
 
     def compose(self) -> ComposeResult:
@@ -138,18 +168,9 @@ class InteractiveShell(App[None]):
             yield Static("Proxtract", classes="title")
             yield Static("Минималистичный текстовый интерфейс на Textual.", classes="subtitle")
             with Grid(id="form"):
-                yield Static("Source path", classes="label")
-                yield Input(id="source_path", placeholder="Путь к проекту")
-                yield Static("Output file", classes="label")
-                yield Input(id="output_path", placeholder="Файл для сохранения")
-                yield Static("Max size (KB)", classes="label")
-                yield Input(id="max_size_kb", placeholder="500")
-                yield Static("Tokenizer model", classes="label")
-                yield Input(id="tokenizer_model", placeholder="gpt-4o")
-                yield Static("Include patterns", classes="label")
-                yield Input(id="include_patterns", placeholder="src/**/*.py, README.md")
-                yield Static("Exclude patterns", classes="label")
-                yield Input(id="exclude_patterns", placeholder="tests/**")
+                for input_id, label, placeholder in self._FORM_FIELDS:
+                    yield Static(label, classes="label")
+                    yield Input(id=input_id, placeholder=placeholder)
             with Vertical(id="toggles"):
                 yield Static("Флаги", classes="section-label")
                 for checkbox in self._build_toggle_section():
@@ -163,38 +184,33 @@ class InteractiveShell(App[None]):
         yield Footer()
 
     def _build_toggle_section(self) -> Iterable[Checkbox]:
-        return (
-            Checkbox("Компактный режим", id="compact_mode"),
-            Checkbox("Пропускать пустые", id="skip_empty"),
-            Checkbox("Использовать .gitignore", id="use_gitignore"),
-            Checkbox("Принудительно включать", id="force_include"),
-            Checkbox("Считать токены", id="count_tokens"),
-            Checkbox("Копировать в буфер", id="copy_clipboard"),
-        )
+        return (Checkbox(label, id=checkbox_id) for checkbox_id, label, _ in self._TOGGLE_SPECS)
 
     async def on_mount(self) -> None:
         self._log_widget = self.query_one(Log)
+        self._inputs = {widget.id: widget for widget in self.query(Input) if widget.id}
+        self._checkboxes = {widget.id: widget for widget in self.query(Checkbox) if widget.id}
         self._populate_form()
         self._append_log("Интерфейс готов. Укажите параметры и нажмите \"Извлечь\".")
 
     def _populate_form(self) -> None:
-        self.query_one("#source_path", Input).value = str(self.state.source_root)
-        self.query_one("#output_path", Input).value = str(self.state.output_path)
-        self.query_one("#max_size_kb", Input).value = str(self.state.max_size_kb)
-        self.query_one("#tokenizer_model", Input).value = self.state.tokenizer_model
-        self.query_one("#include_patterns", Input).value = ", ".join(self.state.include_patterns)
-        self.query_one("#exclude_patterns", Input).value = ", ".join(self.state.exclude_patterns)
-        self.query_one("#compact_mode", Checkbox).value = self.state.compact_mode
-        self.query_one("#skip_empty", Checkbox).value = self.state.skip_empty
-        self.query_one("#use_gitignore", Checkbox).value = self.state.use_gitignore
-        self.query_one("#force_include", Checkbox).value = self.state.force_include
-        self.query_one("#count_tokens", Checkbox).value = self.state.enable_token_count
-        self.query_one("#copy_clipboard", Checkbox).value = self.state.copy_to_clipboard
+        with self.batch_update():
+            self._inputs["source_path"].value = str(self.state.source_root)
+            self._inputs["output_path"].value = str(self.state.output_path)
+            self._inputs["max_size_kb"].value = str(self.state.max_size_kb)
+            self._inputs["tokenizer_model"].value = self.state.tokenizer_model
+            self._inputs["include_patterns"].value = ", ".join(self.state.include_patterns)
+            self._inputs["exclude_patterns"].value = ", ".join(self.state.exclude_patterns)
+            for checkbox_id, _, attr in self._TOGGLE_SPECS:
+                self._checkboxes[checkbox_id].value = getattr(self.state, attr)
 
     def _append_log(self, message: str) -> None:
         self._messages.append(message)
-        if self._log_widget is not None:
-            self._log_widget.write_line(message)
+        self._log_widget.write_line(message)
+
+    def _append_log_lines(self, lines: list[str]) -> None:
+        self._messages.extend(lines)
+        self._log_widget.write_lines(lines)
 
     @property
     def messages(self) -> list[str]:
@@ -249,8 +265,9 @@ class InteractiveShell(App[None]):
 
         self._append_log(f"Начинаем извлечение из {root} в {destination}...")
 
+        loop = asyncio.get_running_loop()
         try:
-            stats = await self.call_in_thread(self._perform_extract, root, destination)
+            stats = await asyncio.to_thread(self._perform_extract, root, destination, loop)
         except ExtractionError as exc:
             self._append_log(f"[Ошибка] Извлечение завершилось с ошибкой: {exc}")
             return
@@ -259,19 +276,23 @@ class InteractiveShell(App[None]):
             return
 
         self.state.last_stats = stats
-        for line in self._format_summary(stats):
-            self._append_log(line)
+        self._append_log_lines(self._format_summary(stats))
 
         if self.state.copy_to_clipboard:
-            await self.call_in_thread(self._copy_to_clipboard, stats)
+            try:
+                await asyncio.to_thread(self._copy_to_clipboard, stats)
+            except Exception as exc:  # pragma: no cover - platform specific
+                self._append_log(f"[Предупреждение] Не удалось скопировать: {exc}")
+            else:
+                self._append_log("Результат скопирован в буфер обмена.")
 
     def _update_state_from_form(self) -> None:
-        source = self.query_one("#source_path", Input).value.strip()
-        output = self.query_one("#output_path", Input).value.strip()
-        max_size = self.query_one("#max_size_kb", Input).value.strip()
-        tokenizer = self.query_one("#tokenizer_model", Input).value.strip()
-        include_raw = self.query_one("#include_patterns", Input).value
-        exclude_raw = self.query_one("#exclude_patterns", Input).value
+        source = self._inputs["source_path"].value.strip()
+        output = self._inputs["output_path"].value.strip()
+        max_size = self._inputs["max_size_kb"].value.strip()
+        tokenizer = self._inputs["tokenizer_model"].value.strip()
+        include_raw = self._inputs["include_patterns"].value
+        exclude_raw = self._inputs["exclude_patterns"].value
 
         if not source:
             raise ValueError("source_path не может быть пустым")
@@ -291,55 +312,75 @@ class InteractiveShell(App[None]):
         self.state.tokenizer_model = tokenizer or self.state.tokenizer_model
         self.state.include_patterns = self._parse_patterns(include_raw)
         self.state.exclude_patterns = self._parse_patterns(exclude_raw)
-        self.state.compact_mode = self.query_one("#compact_mode", Checkbox).value
-        self.state.skip_empty = self.query_one("#skip_empty", Checkbox).value
-        self.state.use_gitignore = self.query_one("#use_gitignore", Checkbox).value
-        self.state.force_include = self.query_one("#force_include", Checkbox).value
-        self.state.enable_token_count = self.query_one("#count_tokens", Checkbox).value
-        self.state.copy_to_clipboard = self.query_one("#copy_clipboard", Checkbox).value
+        for checkbox_id, _, attr in self._TOGGLE_SPECS:
+            setattr(self.state, attr, self._checkboxes[checkbox_id].value)
 
     def _parse_patterns(self, value: str) -> list[str]:
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return []
-        return [item.strip() for item in value.split(",") if item.strip()]
-
-    def _perform_extract(self, root: Path, destination: Path) -> ExtractionStats:
-        extractor = self.state.create_extractor()
+        return [item for item in _PATTERN_SPLIT_RE.split(value) if item]
+
+    def _perform_extract(
+        self, root: Path, destination: Path, loop: asyncio.AbstractEventLoop
+    ) -> ExtractionStats:
+        extractor = self.state.get_or_build_extractor()
+        pending: list[str] = []
+        lock = threading.Lock()
+        scheduled = False
+
+        def _drain() -> None:  # Runs on the event loop.
+            nonlocal scheduled
+            with lock:
+                batch = pending[:]
+                pending.clear()
+                scheduled = False
+            if batch:
+                self._append_log_lines(batch)
 
         def _callback(advance: int = 1, description: str | None = None) -> None:
-            if description:
-                self.call_from_thread(self._append_log, f"→ {description}")
+            nonlocal scheduled
+            if not description:
+                return
+            with lock:
+                pending.append(f"→ {description}")
+                if scheduled:
+                    return
+                scheduled = True
+            # The first line of a batch arms a timer, so it is shown within one
+            # frame even if the next file takes a long time to process.
+            loop.call_soon_threadsafe(loop.call_later, _PROGRESS_FLUSH_INTERVAL, _drain)
 
-        return extractor.extract(root, destination, progress_callback=_callback)
-
-    def _format_summary(self, stats: ExtractionStats) -> Iterable[str]:
-        yield "[Готово] Извлечение завершено."
-        yield f"Файлов обработано: {stats.processed_files}"
-        yield f"Всего байт: {stats.total_bytes}"
+        try:
+            return extractor.extract(root, destination, progress_callback=_callback)
+        finally:
+            loop.call_soon_threadsafe(_drain)
+
+    def _format_summary(self, stats: ExtractionStats) -> list[str]:
+        lines = [
+            "[Готово] Извлечение завершено.",
+            f"Файлов обработано: {stats.processed_files}",
+            f"Всего байт: {stats.total_bytes}",
+        ]
         if stats.token_count is not None:
-            token_info = f"Токены: {stats.token_count}"
-            if stats.token_model:
-                token_info += f" ({stats.token_model})"
-            yield token_info
+            model_suffix = f" ({stats.token_model})" if stats.token_model else ""
+            lines.append(f"Токены: {stats.token_count}{model_suffix}")
         skipped = ", ".join(f"{reason}: {count}" for reason, count in stats.skipped.items() if count)
         if skipped:
-            yield f"Пропущено: {skipped}"
+            lines.append(f"Пропущено: {skipped}")
         if stats.errors:
-            yield "Предупреждения: " + " | ".join(stats.errors)
-        yield f"Результат: {stats.output}"
+            lines.append(f"Предупреждения: {' | '.join(stats.errors)}")
+        lines.append(f"Результат: {stats.output}")
+        return lines
 
     def _copy_to_clipboard(self, stats: ExtractionStats) -> None:
-        try:
-            import pyperclip  # type: ignore
-
-            contents = Path(stats.output).read_text(encoding="utf-8")
-            pyperclip.copy(contents)
-            self.call_from_thread(self._append_log, "Результат скопирован в буфер обмена.")
-        except Exception as exc:  # pragma: no cover - platform specific
-            self.call_from_thread(self._append_log, f"[Предупреждение] Не удалось скопировать: {exc}")
+        pyperclip = load_pyperclip()
+        if pyperclip is None:
+            raise RuntimeError("pyperclip не установлен")
+        pyperclip.copy(read_clipboard_payload(stats.output))
 
 
-def run_interactive(console: Console | None = None) -> None:  # noqa: ARG001 - console retained for compatibility
+def run_interactive() -> None:
     """Launch the Textual interface."""
 
     InteractiveShell().run()
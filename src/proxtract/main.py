@@ -9,9 +9,8 @@ from typing import Optional, Sequence
 
 from rich.console import Console
 
-from .interactive import run_interactive
 from .state import AppState
-from .utils import create_console
+from .utils import create_console, load_pyperclip, read_clipboard_payload
 
 try:  # Shell auto-completion support
     import argcomplete  # type: ignore
@@ -26,41 +25,58 @@ except Exception:  # pragma: no cover - fallback when persistence unavailable
     apply_config = lambda state, data: state  # type: ignore
     load_config = lambda: {}  # type: ignore
     _save_config = None  # type: ignore
-def _run_cli_extract(args: argparse.Namespace, console: Console) -> int:
-    state = apply_config(AppState(), load_config())
 
+# Tokenizer models offered by shell completion for --tokenizer-model.
+_TOKENIZER_SUGGESTIONS = ("gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo", "o200k_base")
+
+# (argument, AppState attribute) pairs for repeatable pattern flags.
+_CLI_PATTERN_OPTIONS = (
+    ("include", "include_patterns"),
+    ("exclude", "exclude_patterns"),
+)
+
+# (enable flag, disable flag, AppState attribute) triples for boolean toggles.
+_CLI_TOGGLE_OPTIONS = (
+    ("compact", "no_compact", "compact_mode"),
+    ("skip_empty", "no_skip_empty", "skip_empty"),
+    ("use_gitignore", "no_gitignore", "use_gitignore"),
+    ("force_include", "no_force_include", "force_include"),
+    (None, "no_token_count", "enable_token_count"),
+    ("copy", None, "copy_to_clipboard"),
+)
+
+
+def run_interactive() -> None:
+    """Launch the Textual shell; imported lazily so CLI runs skip Textual."""
+
+    from .interactive import run_interactive as _run_interactive
+
+    _run_interactive()
+
+
+def _apply_cli_overrides(state: AppState, args: argparse.Namespace) -> None:
     if args.output:
         state.set_output_path(args.output)
     if args.max_size is not None:
         state.max_size_kb = args.max_size
-    if args.compact:
-        state.compact_mode = True
-    elif args.no_compact:
-        state.compact_mode = False
-    if args.skip_empty:
-        state.skip_empty = True
-    elif args.no_skip_empty:
-        state.skip_empty = False
-    if args.use_gitignore:
-        state.use_gitignore = True
-    elif args.no_gitignore:
-        state.use_gitignore = False
-    if args.include:
-        state.include_patterns = [str(pattern) for pattern in args.include]
-    if args.exclude:
-        state.exclude_patterns = [str(pattern) for pattern in args.exclude]
-    if args.force_include:
-        state.force_include = True
-    elif args.no_force_include:
-        state.force_include = False
     if args.tokenizer_model:
         state.tokenizer_model = args.tokenizer_model
-    if args.no_token_count:
-        state.enable_token_count = False
-    if args.copy:
-        state.copy_to_clipboard = True
+    for flag, attr in _CLI_PATTERN_OPTIONS:
+        patterns = getattr(args, flag)
+        if patterns:
+            setattr(state, attr, [str(pattern) for pattern in patterns])
+    for enable, disable, attr in _CLI_TOGGLE_OPTIONS:
+        if enable is not None and getattr(args, enable):
+            setattr(state, attr, True)
+        elif disable is not None and getattr(args, disable):
+            setattr(state, attr, False)
+
 
-    extractor = state.create_extractor()
+def _run_cli_extract(args: argparse.Namespace, console: Console) -> int:
+    state = apply_config(AppState(), load_config())
+    _apply_cli_overrides(state, args)
+
+    extractor = state.get_or_build_extractor()
     root = Path(args.path).expanduser()
     output = state.output_path
 
@@ -81,18 +97,16 @@ def _run_cli_extract(args: argparse.Namespace, console: Console) -> int:
         for warning in stats.errors:
             console.print(f"  • {warning}")
 
-    if state.copy_to_clipboard or args.copy:
-        try:
-            import pyperclip  # type: ignore
-
+    if state.copy_to_clipboard:
+        pyperclip = load_pyperclip()
+        if pyperclip is None:
+            console.print("[yellow]pyperclip not installed; cannot copy to clipboard.[/yellow]")
+        else:
             try:
-                contents = Path(stats.output).read_text(encoding="utf-8")
-                pyperclip.copy(contents)
+                pyperclip.copy(read_clipboard_payload(stats.output))
                 console.print("[green]Copied extracted content to clipboard.[/green]")
             except Exception as exc:  # pragma: no cover - environment specific
                 console.print(f"[yellow]Failed to copy to clipboard:[/yellow] {exc}")
-        except Exception:
-            console.print("[yellow]pyperclip not installed; cannot copy to clipboard.[/yellow]")
 
     if args.save_config and _save_config is not None:
         try:
@@ -158,15 +172,12 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         except Exception:
             ChoicesCompleter = None  # type: ignore[assignment]
         else:
-            token_models = ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo", "o200k_base"]
-            tokenizer_argument.completer = ChoicesCompleter(token_models)  # type: ignore[attr-defined]
+            tokenizer_argument.completer = ChoicesCompleter(_TOKENIZER_SUGGESTIONS)  # type: ignore[attr-defined]
 
         argcomplete.autocomplete(parser)  # type: ignore[call-arg]
 
-    shared_console = create_console()
-
     if not args_list:
-        run_interactive(shared_console)
+        run_interactive()
         return
 
     args = parser.parse_args(args_list)
@@ -174,7 +185,7 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     if args.command == "extract":
         raise SystemExit(_run_cli_extract(args, create_console()))
 
-    run_interactive(shared_console)
+    run_interactive()
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -4,11 +4,28 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Hashable, Optional, Sequence
 
 from .core import ExtractionStats, FileExtractor
 
 
+# (FileExtractor keyword, AppState attribute) for every setting the extractor reads.
+_EXTRACTOR_SETTINGS: tuple[tuple[str, str], ...] = (
+    ("max_file_size_kb", "max_size_kb"),
+    ("skip_empty", "skip_empty"),
+    ("compact_mode", "compact_mode"),
+    ("use_gitignore", "use_gitignore"),
+    ("include_patterns", "include_patterns"),
+    ("exclude_patterns", "exclude_patterns"),
+    ("force_include", "force_include"),
+    ("tokenizer_model", "tokenizer_model"),
+    ("count_tokens", "enable_token_count"),
+    ("skip_extensions", "skip_extensions"),
+    ("skip_patterns", "skip_patterns"),
+    ("skip_files", "skip_files"),
+)
+
+
 @dataclass
 class AppState:
     """Mutable configuration shared across TUI widgets and CLI commands."""
@@ -31,23 +48,48 @@ class AppState:
     copy_to_clipboard: bool = False
     last_stats: Optional[ExtractionStats] = None
 
+    def __post_init__(self) -> None:
+        # Plain attribute, not a field: kept out of fields(), asdict() and eq.
+        self._extractor_cache: Optional[tuple[tuple[Hashable, ...], FileExtractor]] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Copies and pickles start without the cached extractor.
+        state = self.__dict__.copy()
+        state["_extractor_cache"] = None
+        return state
+
+    def _extractor_kwargs(self) -> dict[str, Any]:
+        return {keyword: getattr(self, attr) for keyword, attr in _EXTRACTOR_SETTINGS}
+
+    def _extractor_key(self) -> tuple[Hashable, ...]:
+        def _freeze(value: Any) -> Hashable:
+            if isinstance(value, list):
+                return tuple(value)
+            if isinstance(value, set):
+                return frozenset(value)
+            return value
+
+        return tuple(_freeze(value) for value in self._extractor_kwargs().values())
+
+    def get_or_build_extractor(self) -> FileExtractor:
+        """Return a cached ``FileExtractor``, rebuilding it when settings change."""
+
+        key = self._extractor_key()
+        cached = self._extractor_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        extractor = self.create_extractor()
+        self._extractor_cache = (key, extractor)
+        return extractor
+
     def create_extractor(self) -> FileExtractor:
         """Instantiate a ``FileExtractor`` with the current settings."""
 
-        return FileExtractor(
-            max_file_size_kb=self.max_size_kb,
-            skip_empty=self.skip_empty,
-            compact_mode=self.compact_mode,
-            use_gitignore=self.use_gitignore,
-            include_patterns=self.include_patterns,
-            exclude_patterns=self.exclude_patterns,
-            force_include=self.force_include,
-            tokenizer_model=self.tokenizer_model,
-            count_tokens=self.enable_token_count,
-            skip_extensions=None if self.skip_extensions is None else set(self.skip_extensions),
-            skip_patterns=None if self.skip_patterns is None else set(self.skip_patterns),
-            skip_files=None if self.skip_files is None else set(self.skip_files),
-        )
+        kwargs = self._extractor_kwargs()
+        for keyword, value in kwargs.items():
+            if isinstance(value, set):
+                kwargs[keyword] = set(value)
+        return FileExtractor(**kwargs)
 
     def set_output_path(self, path: str | Path) -> None:
         self.output_path = Path(path).expanduser()
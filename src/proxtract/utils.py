@@ -4,16 +4,31 @@ from __future__ import annotations
 
 import os
 import sys
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, IO, Iterable
 
 from rich.console import Console
 
 _TRUE_WORDS = {"1", "true", "yes", "on", "y", "t"}
 _FALSE_WORDS = {"0", "false", "no", "off", "n", "f"}
+_BOOL_TOKENS: dict[str, bool] = {
+    **{word: True for word in _TRUE_WORDS},
+    **{word: False for word in _FALSE_WORDS},
+}
 
 _ENV_TRUE = {"1", "true", "yes", "on", "enable"}
 _ENV_FALSE = {"0", "false", "no", "off", ""}
 
+CLIPBOARD_MAX_BYTES = 32 * 1024 * 1024
+
+
+@lru_cache(maxsize=128)
+def _normalize_str(value: str) -> bool | None:
+    """Return the boolean spelled by ``value`` or ``None`` if unrecognised."""
+
+    return _BOOL_TOKENS.get(value.strip().lower())
+
 
 def normalize_bool(value: Any, default: bool) -> bool:
     """Return a normalized boolean value from arbitrary input.
@@ -37,11 +52,9 @@ def normalize_bool(value: Any, default: bool) -> bool:
         return bool(value)
 
     if isinstance(value, str):
-        normalized = value.strip().lower()
-        if normalized in _TRUE_WORDS:
-            return True
-        if normalized in _FALSE_WORDS:
-            return False
+        parsed = _normalize_str(value)
+        if parsed is not None:
+            return parsed
 
     return default
 
@@ -99,6 +112,38 @@ def supports_color(stream: IO[str] | None = None) -> bool:
     return True
 
 
+@lru_cache(maxsize=1)
+def load_pyperclip() -> Any:
+    """Import ``pyperclip`` on first use; ``None`` if it is unavailable."""
+
+    try:  # Optional dependency for clipboard support
+        import pyperclip  # type: ignore
+    except Exception:  # pragma: no cover - dependency optional
+        return None
+    return pyperclip
+
+
+def read_clipboard_payload(path: str | os.PathLike[str], *, limit: int = CLIPBOARD_MAX_BYTES) -> str:
+    """Return the extracted bundle at ``path`` decoded for clipboard copy.
+
+    Args:
+        path: Output file produced by the extractor.
+        limit: Maximum file size in bytes that may be loaded into memory.
+
+    Returns:
+        The file contents decoded as UTF-8.
+
+    Raises:
+        ValueError: If the file is larger than ``limit``.
+        OSError: If the file cannot be inspected or read.
+    """
+
+    size = os.path.getsize(path)
+    if size > limit:
+        raise ValueError(f"output is {size} bytes, larger than the {limit} byte clipboard limit")
+    return Path(path).read_bytes().decode("utf-8")
+
+
 def create_console(*, plain: bool | None = None, **kwargs) -> Console:
     """Return a Rich console tuned for the current environment."""
 
@@ -124,4 +169,11 @@ def create_console(*, plain: bool | None = None, **kwargs) -> Console:
     return console
 
 
-__all__ = ["normalize_bool", "supports_color", "create_console"]
+__all__ = [
+    "CLIPBOARD_MAX_BYTES",
+    "normalize_bool",
+    "supports_color",
+    "load_pyperclip",
+    "read_clipboard_payload",
+    "create_console",
+]
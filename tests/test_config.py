@@ -1,133 +1,248 @@
 """Unit tests for configuration loading and saving."""
 
+# pytest: parallel-safe. Every test works under its own tmp_path and patches
+# proxtract.config through monkeypatch only, so the module can run with
+# ``pytest -n auto --dist loadfile``. Keep it that way.
+
 from __future__ import annotations
 
+import os
+from dataclasses import fields
+
 import pytest
-import tempfile
 from pathlib import Path
-from unittest.mock import patch, mock_open
-import json
+from typing import Any, Iterator, Mapping
 
-from proxtract.config import load_config, apply_config, save_config, _config_path
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11; tomli comes from the "config" extra
+    tomllib = pytest.importorskip("tomli")
+
+from proxtract.config import load_config, apply_config, save_config, _clear_load_cache, _config_path
 from proxtract.state import AppState
 
 
+# AppState fields written by save_config and restored by apply_config.
+PERSISTED_FIELDS = frozenset(
+    {
+        "source_root",
+        "output_path",
+        "max_size_kb",
+        "compact_mode",
+        "skip_empty",
+        "use_gitignore",
+        "force_include",
+        "include_patterns",
+        "exclude_patterns",
+        "skip_extensions",
+        "skip_patterns",
+        "skip_files",
+        "tokenizer_model",
+        "enable_token_count",
+        "copy_to_clipboard",
+    }
+)
+
+
+class _StubTomliW:
+    """Minimal tomli_w replacement that writes a fixed payload."""
+
+    @staticmethod
+    def dumps(data):
+        return "mocked toml"
+
+
+@pytest.fixture(autouse=True)
+def config_path(mock_config_path: Path) -> Iterator[Path]:
+    """Redirect every test's settings file into its own tmp_path."""
+    _clear_load_cache()
+    yield mock_config_path
+    _clear_load_cache()
+
+
+@pytest.fixture(scope="module")
+def loaded_full_config(valid_toml_file: Path) -> Mapping[str, Any]:
+    """Parse the shared fully populated settings file once per module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("proxtract.config._config_path", lambda: valid_toml_file)
+        return load_config()
+
+
+@pytest.fixture(scope="module")
+def fully_populated_state() -> AppState:
+    """AppState with every persisted setting set explicitly; shared, do not mutate."""
+    state = AppState()
+    state.source_root = Path("project", "src")
+    state.output_path = Path("test.txt")
+    state.max_size_kb = 1000
+    state.compact_mode = False
+    state.skip_empty = True
+    state.use_gitignore = True
+    state.include_patterns = ["*.py"]
+    state.exclude_patterns = ["*.log"]
+    state.skip_extensions = {".pdf"}
+    state.skip_patterns = {"__pycache__"}
+    state.skip_files = {"package.json"}
+    state.tokenizer_model = "gpt-4"
+    state.enable_token_count = True
+    state.copy_to_clipboard = False
+    state.force_include = True
+    return state
+
+
+@pytest.fixture(scope="module")
+def saved_config_text(
+    tmp_path_factory: pytest.TempPathFactory, fully_populated_state: AppState
+) -> str:
+    """Save a fully populated state through the manual writer once per module."""
+    config_file = tmp_path_factory.mktemp("saved") / "settings.toml"
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("proxtract.config._config_path", lambda: config_file)
+        # Force the manual construction fallback
+        mp.setattr("proxtract.config._tomli_w", None)
+        save_config(fully_populated_state)
+    return config_file.read_text(encoding="utf-8")
+
+
 class TestConfigPath:
     """Test config path generation."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_config_path_cache(self):
+        _config_path.cache_clear()
+        yield
+        _config_path.cache_clear()
+
     def test_config_path_default(self):
         """Test default config path generation."""
         config_path = _config_path()
         assert config_path.name == "settings.toml"
         assert "proxtract" in str(config_path)
-        assert config_path.expanduser().exists() or str(config_path).startswith("~/")
+        assert config_path.parent.name == "proxtract"
+        assert config_path.is_absolute() or str(config_path).startswith("~")
 
 
 class TestLoadConfig:
     """Test configuration loading."""
 
-    def test_load_config_empty_when_file_not_exists(self):
+    def test_load_config_empty_when_file_not_exists(self, config_path: Path):
         """Test loading config when file doesn't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = Path(tmpdir) / "nonexistent.toml"
-                
-                config = load_config()
-                assert config == {}
-
-    def test_load_config_empty_when_toml_not_available(self):
+        assert not config_path.exists()
+
+        config = load_config()
+        assert config == {}
+
+    def test_load_config_empty_file(self, config_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """An empty settings file is treated as no config without being read."""
+        config_path.touch()
+        monkeypatch.setattr(Path, "open", lambda self, *args, **kwargs: pytest.fail("opened"))
+
+        assert load_config() == {}
+
+    def test_load_config_empty_when_toml_not_available(self, config_path: Path, monkeypatch: pytest.MonkeyPatch):
         """Test loading config when TOML library is not available."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "settings.toml"
-            config_file.write_text('key = "value"', encoding="utf-8")
-            
-            with patch('proxtract.config._tomllib', None):
-                config = load_config()
-                assert config == {}
-
-    def test_load_config_invalid_toml(self):
+        config_path.write_text('key = "value"', encoding="utf-8")
+        
+        monkeypatch.setattr("proxtract.config._tomllib", None)
+        config = load_config()
+        assert config == {}
+
+    def test_load_config_invalid_toml(self, config_path: Path):
         """Test loading config with invalid TOML content."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "settings.toml"
-            config_file.write_text('invalid toml content [}', encoding="utf-8")
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_file
-                
-                config = load_config()
-                assert config == {}
-
-    def test_load_config_valid_toml(self):
+        config_path.write_text('invalid toml content [}', encoding="utf-8")
+        
+        config = load_config()
+        assert config == {}
+
+    @pytest.mark.parametrize(
+        ("key", "expected"),
+        [
+            ("output_path", "test.txt"),
+            ("max_size_kb", 1000),
+            ("compact_mode", False),
+            ("skip_empty", False),
+            ("use_gitignore", False),
+            ("include_patterns", ["*.py", "src/*"]),
+            ("exclude_patterns", ["*.log", "test_*"]),
+            ("skip_extensions", [".pdf", ".png"]),
+            ("skip_patterns", ["__pycache__", ".git"]),
+            ("skip_files", ["package.json", "requirements.txt"]),
+            ("tokenizer_model", "gpt-3.5-turbo"),
+            ("enable_token_count", False),
+            ("copy_to_clipboard", True),
+            ("force_include", True),
+        ],
+    )
+    def test_load_config_valid_toml(self, loaded_full_config: Mapping[str, Any], key: str, expected):
         """Test loading config with valid TOML content."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "settings.toml"
-            toml_content = '''
-output_path = "test.txt"
-max_size_kb = 1000
-compact_mode = false
-skip_empty = false
-use_gitignore = false
-include_patterns = ["*.py", "src/*"]
-exclude_patterns = ["*.log", "test_*"]
-skip_extensions = [".pdf", ".png"]
-skip_patterns = ["__pycache__", ".git"]
-skip_files = ["package.json", "requirements.txt"]
-tokenizer_model = "gpt-3.5-turbo"
-enable_token_count = false
-copy_to_clipboard = true
-force_include = true
-'''
-            config_file.write_text(toml_content, encoding="utf-8")
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_file
-                
-                config = load_config()
-                
-                assert config["output_path"] == "test.txt"
-                assert config["max_size_kb"] == 1000
-                assert config["compact_mode"] is False
-                assert config["skip_empty"] is False
-                assert config["use_gitignore"] is False
-                assert config["include_patterns"] == ["*.py", "src/*"]
-                assert config["exclude_patterns"] == ["*.log", "test_*"]
-                assert config["skip_extensions"] == [".pdf", ".png"]
-                assert config["skip_patterns"] == ["__pycache__", ".git"]
-                assert config["skip_files"] == ["package.json", "requirements.txt"]
-                assert config["tokenizer_model"] == "gpt-3.5-turbo"
-                assert config["enable_token_count"] is False
-                assert config["copy_to_clipboard"] is True
-                assert config["force_include"] is True
-
-    def test_load_config_partial_config(self):
+        assert loaded_full_config[key] == expected
+        assert type(loaded_full_config[key]) is type(expected)
+
+    def test_load_config_caches_on_mtime(self, config_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Repeated loads reuse the parsed file until it changes on disk."""
+        config_path.write_text('max_size_kb = 1000\n', encoding="utf-8")
+        first = load_config()
+
+        reads = []
+        original_open = Path.open
+
+        def counting_open(self, mode="r", *args, **kwargs):
+            if mode == "rb":
+                reads.append(self)
+            return original_open(self, mode, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "open", counting_open)
+
+        with pytest.raises(TypeError):
+            first["max_size_kb"] = 1
+        assert load_config() is first
+        assert reads == []
+
+        config_path.write_text('max_size_kb = 20000\n', encoding="utf-8")
+        assert load_config() == {"max_size_kb": 20000}
+        assert reads == [config_path]
+
+    def test_load_config_sees_same_size_save(self, config_path: Path, app_state_default: AppState):
+        """A save invalidates the cache even if size and mtime do not change."""
+        state = app_state_default
+        state.max_size_kb = 1000
+        save_config(state)
+        assert load_config()["max_size_kb"] == 1000
+        before = config_path.stat()
+
+        state.max_size_kb = 2000
+        save_config(state)
+        # Simulate a filesystem whose timestamps did not tick between writes
+        os.utime(config_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+        assert config_path.stat().st_size == before.st_size
+
+        assert load_config()["max_size_kb"] == 2000
+
+    def test_load_config_partial_config(self, config_path: Path):
         """Test loading config with only some settings."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "settings.toml"
-            toml_content = '''
+        toml_content = '''
 output_path = "custom.txt"
 max_size_kb = 2000
 compact_mode = true
 '''
-            config_file.write_text(toml_content, encoding="utf-8")
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_file
-                
-                config = load_config()
-                
-                assert config["output_path"] == "custom.txt"
-                assert config["max_size_kb"] == 2000
-                assert config["compact_mode"] is True
-                # Other settings should not be present
-                assert "skip_empty" not in config
+        config_path.write_text(toml_content, encoding="utf-8")
+        
+        config = load_config()
+        
+        assert config["output_path"] == "custom.txt"
+        assert config["max_size_kb"] == 2000
+        assert config["compact_mode"] is True
+        # Other settings should not be present
+        assert "skip_empty" not in config
 
 
 class TestApplyConfig:
     """Test configuration application to AppState."""
 
-    def test_apply_config_empty_data(self):
+    def test_apply_config_empty_data(self, app_state_default: AppState):
         """Test applying empty config data."""
-        state = AppState()
+        state = app_state_default
         original_output = state.output_path
         original_max_size = state.max_size_kb
         
@@ -137,9 +252,9 @@ class TestApplyConfig:
         assert state.output_path == original_output
         assert state.max_size_kb == original_max_size
 
-    def test_apply_config_basic_settings(self):
+    def test_apply_config_basic_settings(self, app_state_default: AppState):
         """Test applying basic configuration settings."""
-        state = AppState()
+        state = app_state_default
         
         config_data = {
             "output_path": "custom_output.txt",
@@ -160,31 +275,28 @@ class TestApplyConfig:
         assert state.use_gitignore is False
         assert state.force_include is True
 
-    def test_apply_config_boolean_strings(self):
+    @pytest.mark.parametrize(
+        ("attr", "value", "expected"),
+        [
+            ("compact_mode", "false", False),
+            ("skip_empty", "no", False),
+            ("use_gitignore", "0", False),
+            ("enable_token_count", "False", False),
+            ("copy_to_clipboard", "yes", True),
+            ("force_include", "1", True),
+        ],
+    )
+    def test_apply_config_boolean_strings(self, app_state_default: AppState, attr: str, value: str, expected: bool):
         """Test applying boolean settings from string values."""
-        state = AppState()
+        state = app_state_default
 
-        config_data = {
-            "compact_mode": "false",
-            "skip_empty": "no",
-            "use_gitignore": "0",
-            "enable_token_count": "False",
-            "copy_to_clipboard": "yes",
-            "force_include": "1",
-        }
+        apply_config(state, {attr: value})
 
-        apply_config(state, config_data)
+        assert getattr(state, attr) is expected
 
-        assert state.compact_mode is False
-        assert state.skip_empty is False
-        assert state.use_gitignore is False
-        assert state.enable_token_count is False
-        assert state.copy_to_clipboard is True
-        assert state.force_include is True
-
-    def test_apply_config_include_patterns(self):
+    def test_apply_config_include_patterns(self, app_state_default: AppState):
         """Test applying include patterns configuration."""
-        state = AppState()
+        state = app_state_default
         
         config_data = {
             "include_patterns": ["*.py", "src/*", "docs/*.md"],
@@ -196,9 +308,9 @@ class TestApplyConfig:
         assert state.include_patterns == ["*.py", "src/*", "docs/*.md"]
         assert state.exclude_patterns == ["*.log", "test_*", "node_modules/*"]
 
-    def test_apply_config_filtering_rules(self):
+    def test_apply_config_filtering_rules(self, app_state_default: AppState):
         """Test applying filtering rules configuration."""
-        state = AppState()
+        state = app_state_default
         
         config_data = {
             "skip_extensions": [".pdf", ".png", ".jpg"],
@@ -212,9 +324,9 @@ class TestApplyConfig:
         assert state.skip_patterns == {"__pycache__", ".git", "test_*"}
         assert state.skip_files == {"package.json", "requirements.txt", "Dockerfile"}
 
-    def test_apply_config_disable_filters(self):
+    def test_apply_config_disable_filters(self, app_state_default: AppState):
         """Empty collections should disable custom filters."""
-        state = AppState()
+        state = app_state_default
 
         config_data = {
             "skip_extensions": [],
@@ -228,9 +340,9 @@ class TestApplyConfig:
         assert state.skip_patterns == set()
         assert state.skip_files == set()
 
-    def test_apply_config_tokenizer_settings(self):
+    def test_apply_config_tokenizer_settings(self, app_state_default: AppState):
         """Test applying tokenizer configuration."""
-        state = AppState()
+        state = app_state_default
         
         config_data = {
             "tokenizer_model": "gpt-3.5-turbo",
@@ -244,9 +356,9 @@ class TestApplyConfig:
         assert state.enable_token_count is False
         assert state.copy_to_clipboard is True
 
-    def test_apply_config_path_expansion(self):
+    def test_apply_config_path_expansion(self, app_state_default: AppState):
         """Test that output paths are properly expanded."""
-        state = AppState()
+        state = app_state_default
         
         config_data = {
             "output_path": "~/documents/output.txt",
@@ -257,9 +369,9 @@ class TestApplyConfig:
         # Should expand user home directory
         assert str(state.output_path).startswith(str(Path.home()))
 
-    def test_apply_config_invalid_data_types(self):
+    def test_apply_config_invalid_data_types(self, app_state_default: AppState):
         """Test handling of invalid data types in config."""
-        state = AppState()
+        state = app_state_default
         
         config_data = {
             "max_size_kb": "invalid",  # Should be int
@@ -279,224 +391,176 @@ class TestApplyConfig:
 class TestSaveConfig:
     """Test configuration saving."""
 
-    def test_save_config_create_directory(self):
+    def test_save_config_create_directory(self, app_state_default: AppState, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
         """Test that save_config creates necessary directories."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "nested" / "config" / "settings.toml"
-            
-            state = AppState()
-            state.output_path = "test.txt"
-            state.max_size_kb = 1000
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                
-                save_config(state)
-                
-                assert config_path.parent.exists()
-
-    def test_save_config_with_tomli_w(self):
+        config_path = tmp_path / "nested" / "config" / "settings.toml"
+        
+        state = app_state_default
+        state.output_path = "test.txt"
+        state.max_size_kb = 1000
+        
+        monkeypatch.setattr("proxtract.config._config_path", lambda: config_path)
+        
+        save_config(state)
+        
+        assert config_path.parent.exists()
+
+    def test_save_config_with_tomli_w(self, app_state_default: AppState, config_path: Path, monkeypatch: pytest.MonkeyPatch):
         """Test saving config with tomli_w library."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "settings.toml"
-            
-            state = AppState()
-            state.output_path = "test.txt"
-            state.max_size_kb = 1000
-            state.compact_mode = False
-            state.skip_extensions = {".pdf", ".png"}
-            state.skip_patterns = {"__pycache__"}
-            state.skip_files = {"package.json"}
-            state.force_include = True
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                # Mock tomli_w being available
-                with patch('proxtract.config._tomli_w') as mock_tomli_w:
-                    mock_tomli_w.dump = lambda data, handle: handle.write(b"mocked toml")
-                    
-                    save_config(state)
-                    
-                    # Should have created the file
-                    assert config_path.exists()
-
-    def test_save_config_fallback_manual(self):
+        state = app_state_default
+        state.output_path = "test.txt"
+        state.max_size_kb = 1000
+        state.compact_mode = False
+        state.skip_extensions = {".pdf", ".png"}
+        state.skip_patterns = {"__pycache__"}
+        state.skip_files = {"package.json"}
+        state.force_include = True
+        
+        # Mock tomli_w being available
+        monkeypatch.setattr("proxtract.config._tomli_w", _StubTomliW)
+        
+        save_config(state)
+        
+        # Should have written the serializer's output in one piece
+        assert config_path.read_text(encoding="utf-8") == "mocked toml"
+
+    def test_save_config_fallback_manual(self, saved_config_text: str):
         """Test saving config with manual construction fallback."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "settings.toml"
-            
-            state = AppState()
-            state.output_path = "test.txt"
-            state.max_size_kb = 1000
-            state.compact_mode = False
-            state.skip_empty = True
-            state.use_gitignore = True
-            state.include_patterns = ["*.py"]
-            state.exclude_patterns = ["*.log"]
-            state.skip_extensions = {".pdf"}
-            state.skip_patterns = {"__pycache__"}
-            state.skip_files = {"package.json"}
-            state.tokenizer_model = "gpt-4"
-            state.enable_token_count = True
-            state.copy_to_clipboard = False
-            state.force_include = True
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                # Mock tomli_w being unavailable
-                with patch('proxtract.config._tomli_w', None):
-                    save_config(state)
-                    
-                    # Should have created the file with manual construction
-                    assert config_path.exists()
-                    content = config_path.read_text(encoding="utf-8")
-                    
-                    # Check that all values are present
-                    assert 'output_path = "test.txt"' in content
-                    assert 'max_size_kb = 1000' in content
-                    assert 'compact_mode = false' in content
-                    assert 'skip_empty = true' in content
-                    assert 'use_gitignore = true' in content
-                    assert 'include_patterns = ["*.py"]' in content
-                    assert 'exclude_patterns = ["*.log"]' in content
-                    assert 'skip_extensions = [".pdf"]' in content
-                    assert 'skip_patterns = ["__pycache__"]' in content
-                    assert 'skip_files = ["package.json"]' in content
-                    assert 'tokenizer_model = "gpt-4"' in content
-                    assert 'enable_token_count = true' in content
-                    assert 'copy_to_clipboard = false' in content
-                    assert 'force_include = true' in content
-
-    def test_save_config_string_escaping(self):
+        parsed = tomllib.loads(saved_config_text)
+
+        assert parsed.pop("source_root") == str(Path("project", "src"))
+        assert parsed == {
+            "output_path": "test.txt",
+            "max_size_kb": 1000,
+            "compact_mode": False,
+            "skip_empty": True,
+            "use_gitignore": True,
+            "force_include": True,
+            "include_patterns": ["*.py"],
+            "exclude_patterns": ["*.log"],
+            "tokenizer_model": "gpt-4",
+            "enable_token_count": True,
+            "copy_to_clipboard": False,
+            "skip_extensions": [".pdf"],
+            "skip_patterns": ["__pycache__"],
+            "skip_files": ["package.json"],
+        }
+        # The writer's exact line format is part of the contract as well
+        assert "max_size_kb = 1000" in saved_config_text.splitlines()
+
+    def test_save_config_string_escaping(self, app_state_default: AppState, config_path: Path, monkeypatch: pytest.MonkeyPatch):
         """Test proper escaping of strings in manual construction."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "settings.toml"
-            
-            state = AppState()
-            state.output_path = 'test"with"quotes.txt'
-            state.tokenizer_model = 'model\\with\\backslashes'
-            state.include_patterns = ['pattern"with"quotes', 'path\\with\\backslashes']
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                with patch('proxtract.config._tomli_w', None):
-                    save_config(state)
-                    
-                    content = config_path.read_text(encoding="utf-8")
-                    
-                    # Check proper escaping
-                    assert 'test\\"with\\"quotes.txt' in content
-                    assert 'model\\\\with\\\\backslashes' in content
-                    assert 'pattern\\"with\\"quotes' in content
-                    assert 'path\\\\with\\\\backslashes' in content
-
-    def test_save_config_missing_attributes(self):
+        state = app_state_default
+        state.output_path = 'test"with"quotes.txt'
+        state.tokenizer_model = 'model\\with\\backslashes'
+        state.exclude_patterns = ["line\nbreak", "tab\tstop"]
+        state.include_patterns = ['pattern"with"quotes', 'path\\with\\backslashes']
+        
+        monkeypatch.setattr("proxtract.config._tomli_w", None)
+        save_config(state)
+        
+        parsed = tomllib.loads(config_path.read_text(encoding="utf-8"))
+
+        assert parsed["output_path"] == 'test"with"quotes.txt'
+        assert parsed["tokenizer_model"] == 'model\\with\\backslashes'
+        assert parsed["include_patterns"] == ['pattern"with"quotes', 'path\\with\\backslashes']
+        assert parsed["exclude_patterns"] == ["line\nbreak", "tab\tstop"]
+
+    def test_save_config_missing_attributes(self, config_path: Path, monkeypatch: pytest.MonkeyPatch):
         """Test saving config when state doesn't have all attributes."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "settings.toml"
-            
-            # Create a minimal state without filtering attributes
-            class MinimalState:
-                def __init__(self):
-                    self.output_path = Path("test.txt")
-                    self.max_size_kb = 500
-                    self.compact_mode = True
-                    self.skip_empty = True
-                    self.use_gitignore = True
-                    self.force_include = False
-                    self.include_patterns = []
-                    self.exclude_patterns = []
-                    self.tokenizer_model = "gpt-4"
-                    self.enable_token_count = True
-                    self.copy_to_clipboard = False
-            
-            state = MinimalState()
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                with patch('proxtract.config._tomli_w', None):
-                    # Should not crash on missing attributes
-                    save_config(state)
-                    
-                    assert config_path.exists()
-
-    def test_save_config_with_none_values(self):
+        # Create a minimal state without filtering attributes
+        class MinimalState:
+            def __init__(self):
+                self.output_path = Path("test.txt")
+                self.max_size_kb = 500
+                self.compact_mode = True
+                self.skip_empty = True
+                self.use_gitignore = True
+                self.force_include = False
+                self.include_patterns = []
+                self.exclude_patterns = []
+                self.tokenizer_model = "gpt-4"
+                self.enable_token_count = True
+                self.copy_to_clipboard = False
+        
+        state = MinimalState()
+        
+        monkeypatch.setattr("proxtract.config._tomli_w", None)
+        # Should not crash on missing attributes
+        save_config(state)
+        
+        assert config_path.exists()
+
+    def test_save_config_skips_when_unchanged(self, app_state_default: AppState, config_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Saving identical settings twice leaves the file untouched."""
+        state = app_state_default
+        save_config(state)
+
+        writes = []
+        monkeypatch.setattr("proxtract.config._write_bytes", lambda path, data: writes.append(path))
+
+        save_config(state)
+        assert writes == []
+
+        state.max_size_kb += 1
+        save_config(state)
+        assert writes == [config_path]
+
+    def test_save_config_file_write_error(self, app_state_default: AppState, config_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Errors opening the config file propagate to the caller."""
+        def _fail(*args: Any, **kwargs: Any) -> int:
+            raise OSError("read-only file system")
+
+        monkeypatch.setattr("proxtract.config.os.open", _fail)
+
+        with pytest.raises(OSError, match="read-only"):
+            save_config(app_state_default)
+        assert not config_path.exists()
+
+    def test_save_config_with_none_values(self, app_state_default: AppState, config_path: Path, monkeypatch: pytest.MonkeyPatch):
         """Test saving config with None values."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "settings.toml"
-            
-            state = AppState()
-            # Set some values to None-like states
-            state.include_patterns = []
-            state.exclude_patterns = []
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                with patch('proxtract.config._tomli_w', None):
-                    save_config(state)
-                    
-                    content = config_path.read_text(encoding="utf-8")
-                    
-                    # Should handle empty lists properly
-                    assert 'include_patterns = []' in content
-                    assert 'exclude_patterns = []' in content
+        state = app_state_default
+        # Set some values to None-like states
+        state.include_patterns = []
+        state.exclude_patterns = []
+        
+        monkeypatch.setattr("proxtract.config._tomli_w", None)
+        save_config(state)
+        
+        parsed = tomllib.loads(config_path.read_text(encoding="utf-8"))
+        
+        # Should handle empty lists properly
+        assert parsed["include_patterns"] == []
+        assert parsed["exclude_patterns"] == []
 
 
 class TestConfigRoundTrip:
     """Test complete config load/save round trip."""
 
-    def test_save_and_load_round_trip(self):
-        """Test saving config and loading it back."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "settings.toml"
-            
-            # Create initial state
-            original_state = AppState()
-            original_state.output_path = Path(tmpdir) / "test_output.txt"
-            original_state.max_size_kb = 1500
-            original_state.compact_mode = False
-            original_state.skip_empty = False
-            original_state.use_gitignore = False
-            original_state.include_patterns = ["*.py", "src/*"]
-            original_state.exclude_patterns = ["*.log", "test_*"]
-            original_state.skip_extensions = {".pdf", ".png"}
-            original_state.skip_patterns = {"__pycache__", ".git"}
-            original_state.skip_files = {"package.json", "requirements.txt"}
-            original_state.tokenizer_model = "gpt-3.5-turbo"
-            original_state.enable_token_count = False
-            original_state.copy_to_clipboard = True
-            original_state.force_include = True
-            original_state.force_include = True
-            
-            with patch('proxtract.config._config_path') as mock_path:
-                mock_path.return_value = config_path
-                
-                # Save config
-                save_config(original_state)
-                
-                # Load config back
-                config_data = load_config()
-                
-                # Create new state and apply loaded config
-                new_state = AppState()
-                apply_config(new_state, config_data)
-                
-                # Verify all values match
-                assert new_state.output_path == original_state.output_path
-                assert new_state.max_size_kb == original_state.max_size_kb
-                assert new_state.compact_mode == original_state.compact_mode
-                assert new_state.skip_empty == original_state.skip_empty
-                assert new_state.use_gitignore == original_state.use_gitignore
-                assert new_state.include_patterns == original_state.include_patterns
-                assert new_state.exclude_patterns == original_state.exclude_patterns
-                assert new_state.skip_extensions == original_state.skip_extensions
-                assert new_state.skip_patterns == original_state.skip_patterns
-                assert new_state.skip_files == original_state.skip_files
-                assert new_state.tokenizer_model == original_state.tokenizer_model
-                assert new_state.enable_token_count == original_state.enable_token_count
-                assert new_state.copy_to_clipboard == original_state.copy_to_clipboard
-                assert new_state.force_include == original_state.force_include
-                assert new_state.force_include == original_state.force_include
+    @pytest.mark.parametrize("writer", ["tomli_w", "manual"])
+    def test_save_and_load_round_trip(
+        self, fully_populated_state: AppState, writer: str, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test saving config and loading it back with either serializer."""
+        original_state = fully_populated_state
+        tomli_w = pytest.importorskip("tomli_w") if writer == "tomli_w" else None
+        monkeypatch.setattr("proxtract.config._tomli_w", tomli_w)
+
+        # Save config
+        save_config(original_state)
+        
+        # Load config back
+        config_data = load_config()
+        
+        # Create new state and apply loaded config
+        new_state = AppState()
+        apply_config(new_state, config_data)
+        
+        # Verify all persisted values match
+        assert PERSISTED_FIELDS <= {f.name for f in fields(AppState)}
+        expected = {f.name: getattr(original_state, f.name) for f in fields(AppState) if f.name in PERSISTED_FIELDS}
+        actual = {f.name: getattr(new_state, f.name) for f in fields(AppState) if f.name in PERSISTED_FIELDS}
+        assert actual == expected
 
 
 if __name__ == "__main__":
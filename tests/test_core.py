@@ -6,7 +6,7 @@ import pytest
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from proxtract.core import FileExtractor, ExtractionStats, ExtractionError
+from proxtract.core import FileExtractor, ExtractionStats, ExtractionError, _compile_patterns, _sorted_entries
 
 
 class TestFileFiltering:
@@ -38,6 +38,20 @@ class TestFileFiltering:
         
         assert extractor.skip_patterns == {"__pycache__", "test_*"}
 
+    def test_extension_patterns_precomputed_as_suffixes(self):
+        """Pure ``*.ext`` patterns are stored as suffix tuples at construction."""
+        extractor = FileExtractor(
+            skip_patterns={"*.log", "__pycache__"},
+            include_patterns=["*.py", "src/*"],
+            exclude_patterns=["*.tmp"],
+        )
+
+        assert extractor._skip_suffixes == (".log",)
+        assert extractor._skip_re is not None and extractor._skip_re.match("__pycache__")
+        assert extractor._include_suffixes == (".py",)
+        assert extractor._exclude_suffixes == (".tmp",)
+        assert extractor._exclude_re is None
+
     def test_custom_skip_files(self):
         """Test custom file name filtering rules."""
         extractor = FileExtractor(skip_files={"package.json", "requirements.txt"})
@@ -58,6 +72,22 @@ class TestFileFiltering:
         assert not FileExtractor._match_any(patterns, "app.js")
         assert not FileExtractor._match_any(patterns, "README.md")
 
+        # Any iterable works, and no patterns never match
+        assert FileExtractor._match_any({"*.md"}, "README.md")
+        assert FileExtractor._match_any(("src/*",), "src/pkg/module.py")
+        assert not FileExtractor._match_any([], "main.py")
+
+    def test_compile_patterns_splits_suffixes(self):
+        """Pure ``*.ext`` globs become suffix checks; other globs share a regex."""
+        suffixes, matcher = _compile_patterns(frozenset({"*.py", "*.log", "test_*", "*.tar.gz"}))
+
+        assert suffixes == (".log", ".py")
+        assert matcher is not None
+        assert matcher.match("test_module.txt")
+        assert matcher.match("backup.tar.gz")
+        assert not matcher.match("main.py")
+        assert _compile_patterns(frozenset({"*.md"})) == ((".md",), None)
+
     def test_should_skip_extension_filter(self):
         """Test file skipping due to extension filtering."""
         extractor = FileExtractor(skip_extensions={".pdf", ".png"})
@@ -260,6 +290,16 @@ class TestBinaryDetection:
             zip_file.write_bytes(zip_content)
             assert not FileExtractor._is_text_file(zip_file)
 
+    @pytest.mark.parametrize(
+        "header",
+        [b"\x7fELF\x02\x01\x01", b"\xff\xd8\xff\xe0", b"MZ\x90\x00", b"GIF89a"],
+    )
+    def test_is_text_file_executable_and_image_signatures(self, tmp_path, header):
+        """ELF, JPEG, PE and GIF headers are detected as binary."""
+        sample = tmp_path / "sample"
+        sample.write_bytes(header + b"plain ascii payload")
+        assert not FileExtractor._is_text_file(sample)
+
     def test_is_text_file_null_bytes(self):
         """Test binary file detection with null bytes."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -294,6 +334,11 @@ class TestBinaryDetection:
             bom_file.write_bytes(bom_content)
             assert FileExtractor._is_text_file(bom_file)
 
+            # Test UTF-8 file with non-ASCII characters
+            utf8_file = root / "utf8.txt"
+            utf8_file.write_bytes("Привет, мир\n".encode("utf-8"))
+            assert FileExtractor._is_text_file(utf8_file)
+
     def test_is_text_file_control_characters(self):
         """Test text file detection with high control character ratio."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -560,6 +605,65 @@ class TestExtractionWorkflow:
             assert len(progress_calls) == 2
             assert sum(call[0] for call in progress_calls) == 2
 
+    def test_extract_skips_symlink_to_output(self, tmp_path):
+        """A symlink pointing at the output file is not extracted into itself."""
+        (tmp_path / "file.txt").write_text("content", encoding="utf-8")
+        output_file = tmp_path / "extracted.txt"
+        output_file.write_text("previous run", encoding="utf-8")
+        try:
+            (tmp_path / "link.txt").symlink_to(output_file)
+        except OSError:
+            pytest.skip("symlinks unsupported")
+
+        stats = FileExtractor().extract(tmp_path, output_file)
+
+        assert stats.processed_paths == ["file.txt"]
+        assert "previous run" not in output_file.read_text(encoding="utf-8")
+
+    def test_extract_prunes_skipped_directories(self, tmp_path):
+        """Skipped directories are recorded once and never descended into."""
+        (tmp_path / "main.py").write_text("print('main')", encoding="utf-8")
+        cache_dir = tmp_path / "pkg" / "__pycache__"
+        cache_dir.mkdir(parents=True)
+        for index in range(3):
+            (cache_dir / f"module{index}.txt").write_text("cached", encoding="utf-8")
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / ".hidden" / "notes.txt").write_text("secret", encoding="utf-8")
+
+        with patch("proxtract.core._sorted_entries", wraps=_sorted_entries) as listing:
+            stats = FileExtractor().extract(tmp_path, tmp_path / "out.txt")
+
+        assert stats.processed_paths == ["main.py"]
+        assert sorted(stats.skipped_paths["excluded_path"]) == [".hidden", str(Path("pkg", "__pycache__"))]
+        listed = {Path(call.args[0]).name for call in listing.call_args_list}
+        assert "__pycache__" not in listed
+        assert ".hidden" not in listed
+
+    def test_extract_pruned_directory_reported_once_as_excluded_path(self, tmp_path):
+        """Files in a pruned directory are not attributed to their own skip reasons."""
+        modules = tmp_path / "node_modules"
+        modules.mkdir()
+        (modules / "package.json").write_text("{}", encoding="utf-8")
+        (modules / "logo.png").write_bytes(b"\x89PNG")
+        (modules / "debug.log").write_text("log", encoding="utf-8")
+
+        extractor = FileExtractor(exclude_patterns=["*.log"])
+        stats = extractor.extract(tmp_path, tmp_path / "out.txt")
+
+        assert stats.skipped_paths["excluded_path"] == ["node_modules"]
+        assert stats.skipped == {"excluded_path": 1}
+
+    def test_extract_include_patterns_reach_skipped_directories(self, tmp_path):
+        """Include patterns still see files inside normally skipped directories."""
+        cache_dir = tmp_path / "__pycache__"
+        cache_dir.mkdir()
+        (cache_dir / "keep.txt").write_text("kept", encoding="utf-8")
+
+        extractor = FileExtractor(include_patterns=["__pycache__/*"])
+        stats = extractor.extract(tmp_path, tmp_path / "out.txt")
+
+        assert stats.processed_paths == [str(Path("__pycache__", "keep.txt"))]
+
     def test_extract_creates_missing_output_directory(self):
         """Output directories should be created automatically."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import sys
+import asyncio
+import threading
 from pathlib import Path
 
 import pytest
@@ -89,6 +90,51 @@ async def test_run_extraction(monkeypatch, tmp_path):
     assert any("file.py" in message for message in app.messages)
 
 
+@pytest.mark.asyncio
+async def test_progress_shown_while_next_file_is_slow(monkeypatch, tmp_path):
+    state = AppState()
+    state.set_source_root(tmp_path)
+    output = tmp_path / "result.txt"
+    state.set_output_path(output)
+    release = threading.Event()
+
+    class SlowExtractor:
+        def extract(self, root: Path, destination: Path, progress_callback=None):
+            progress_callback(description="first.py")
+            assert release.wait(5)
+            destination.write_text("payload", encoding="utf-8")
+            return ExtractionStats(
+                root=root,
+                output=destination,
+                processed_paths=["first.py"],
+                total_bytes=7,
+                skipped_paths={},
+                errors=[],
+            )
+
+    monkeypatch.setattr(state, "create_extractor", lambda: SlowExtractor())
+
+    app = InteractiveShell(state=state)
+    progress_shown = asyncio.Event()
+    summary_shown = asyncio.Event()
+    append_log_lines = app._append_log_lines
+
+    def _append_log_lines(lines: list[str]) -> None:
+        append_log_lines(lines)
+        if "→ first.py" in lines:
+            progress_shown.set()
+        if any("Готово" in line for line in lines):
+            summary_shown.set()
+
+    monkeypatch.setattr(app, "_append_log_lines", _append_log_lines)
+    async with app.run_test() as pilot:
+        await pilot.click("#run")
+        await asyncio.wait_for(progress_shown.wait(), 5)
+        assert not summary_shown.is_set()
+        release.set()
+        await asyncio.wait_for(summary_shown.wait(), 5)
+
+
 @pytest.mark.asyncio
 async def test_run_extraction_missing_root(tmp_path):
     state = AppState()
@@ -170,7 +216,7 @@ async def test_copy_to_clipboard(monkeypatch, tmp_path):
             self.value = value
 
     clipboard = DummyClipboard()
-    monkeypatch.setitem(sys.modules, "pyperclip", clipboard)
+    monkeypatch.setattr("proxtract.interactive.load_pyperclip", lambda: clipboard)
     monkeypatch.setattr(state, "create_extractor", lambda: FakeExtractor())
 
     app = InteractiveShell(state=state)
@@ -100,12 +100,62 @@ def test_run_cli_extract_failure(tmp_path, monkeypatch):
     assert "Extraction failed" in console.export_text()
 
 
+def test_apply_cli_overrides_maps_flags_to_state(tmp_path):
+    """CLI flags should be applied to the session state through the option tables."""
+
+    state = prox_main.AppState()
+    args = _make_args(
+        output=str(tmp_path / "bundle.txt"),
+        max_size=64,
+        no_compact=True,
+        no_skip_empty=True,
+        no_gitignore=True,
+        include=["*.py"],
+        exclude=["*.log"],
+        force_include=True,
+        tokenizer_model="gpt-4o",
+        no_token_count=True,
+        copy=True,
+    )
+
+    prox_main._apply_cli_overrides(state, args)
+
+    assert state.output_path == tmp_path / "bundle.txt"
+    assert state.max_size_kb == 64
+    assert state.compact_mode is False
+    assert state.skip_empty is False
+    assert state.use_gitignore is False
+    assert state.include_patterns == ["*.py"]
+    assert state.exclude_patterns == ["*.log"]
+    assert state.force_include is True
+    assert state.tokenizer_model == "gpt-4o"
+    assert state.enable_token_count is False
+    assert state.copy_to_clipboard is True
+
+    prox_main._apply_cli_overrides(state, _make_args(compact=True, skip_empty=True, use_gitignore=True))
+
+    assert state.compact_mode is True
+    assert state.skip_empty is True
+    assert state.use_gitignore is True
+
+
+def test_apply_cli_overrides_ignores_empty_tokenizer_model():
+    """An empty --tokenizer-model keeps the configured model."""
+
+    state = prox_main.AppState()
+    state.tokenizer_model = "gpt-4o"
+
+    prox_main._apply_cli_overrides(state, _make_args(tokenizer_model=""))
+
+    assert state.tokenizer_model == "gpt-4o"
+
+
 def test_main_launches_repl_when_no_args(monkeypatch):
     """main() should launch the REPL when no arguments are provided."""
 
     called = {}
 
-    def fake_launch(console):
+    def fake_launch():
         called["ran"] = True
 
     monkeypatch.setattr(prox_main, "run_interactive", fake_launch)
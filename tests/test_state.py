@@ -0,0 +1,53 @@
+"""Tests for proxtract.state session helpers."""
+
+from __future__ import annotations
+
+import copy
+import pickle
+from dataclasses import asdict, fields
+
+from proxtract.state import AppState
+
+
+def test_get_or_build_extractor_reuses_instance():
+    state = AppState()
+
+    first = state.get_or_build_extractor()
+    second = state.get_or_build_extractor()
+
+    assert first is second
+
+
+def test_get_or_build_extractor_rebuilds_after_settings_change():
+    state = AppState()
+    first = state.get_or_build_extractor()
+
+    state.max_size_kb = 64
+    state.include_patterns = ["*.py"]
+    second = state.get_or_build_extractor()
+
+    assert second is not first
+    assert second.max_file_size == 64 * 1024
+    assert second.include_patterns == ("*.py",)
+
+
+def test_extractor_cache_is_not_a_dataclass_field():
+    state = AppState()
+    state.get_or_build_extractor()
+
+    assert "_extractor_cache" not in {f.name for f in fields(AppState)}
+    assert "_extractor_cache" not in asdict(state)
+    assert copy.deepcopy(state)._extractor_cache is None
+    assert state._extractor_cache is not None
+
+
+def test_copies_rebuild_their_own_extractor():
+    state = AppState()
+    original = state.get_or_build_extractor()
+
+    for clone in (copy.copy(state), copy.deepcopy(state), pickle.loads(pickle.dumps(state))):
+        assert clone._extractor_cache is None
+        rebuilt = clone.get_or_build_extractor()
+        assert rebuilt is not original
+        assert clone.get_or_build_extractor() is rebuilt
+    assert state.get_or_build_extractor() is original
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import io
+import sys
+
+import pytest
 
 from proxtract import utils
 from proxtract.utils import normalize_bool
@@ -53,3 +56,28 @@ def test_create_console_respects_support_detection(monkeypatch):
     monkeypatch.setattr(utils, "supports_color", lambda stream=None: True)
     console_colored = utils.create_console()
     assert console_colored.no_color is False
+
+
+def test_read_clipboard_payload_decodes_utf8(tmp_path):
+    bundle = tmp_path / "bundle.txt"
+    bundle.write_bytes("Привет, world".encode("utf-8"))
+
+    assert utils.read_clipboard_payload(bundle) == "Привет, world"
+
+
+def test_read_clipboard_payload_rejects_oversized_output(tmp_path):
+    bundle = tmp_path / "bundle.txt"
+    bundle.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        utils.read_clipboard_payload(bundle, limit=32)
+
+
+def test_load_pyperclip_imports_once(monkeypatch):
+    utils.load_pyperclip.cache_clear()
+    monkeypatch.setitem(sys.modules, "pyperclip", None)  # import raises ImportError
+
+    assert utils.load_pyperclip() is None
+    monkeypatch.delitem(sys.modules, "pyperclip")
+    assert utils.load_pyperclip() is None  # cached result, no second import
+    utils.load_pyperclip.cache_clear()